@@ -1,64 +1,129 @@
-import json
+import re
 from collections import defaultdict
+from collections.abc import Iterator
+from functools import partial
+from unittest.mock import patch
+from zipfile import ZipFile
 
-import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+import ijson
+import xlsxwriter
 from tqdm import tqdm
 
 FILE_PATH: str = 'data/input_model.json'
-
-
-def explore_json(data: dict, parent_key: str = '') -> list:
+SHEET_NAME_MAX_LENGTH: int = 31
+SHEET_NAME_INVALID_CHARS: re.Pattern = re.compile(r'[\[\]:*?/\\]')
+KEY_COLUMNS: tuple = ('Chave primária', 'Chave secundária', 'Chave terciária')
+INFO_COLUMNS: tuple = (
+    'Exemplo',
+    'Tipo',
+    'Unidade',
+    'Significado',
+    'Obrigatório',
+    'Observações',
+    'Limite Mínimo',
+    'Limite Máximo',
+)
+
+
+def explore_json(data: dict, parent_path: tuple = ()) -> list:
     """Explores a JSON structure and extracts key-value pairs.
 
-    This function recursively navigates a dictionary representing a JSON
-    structure, flattening it into a list of tuples. Each tuple contains
-    the full key path, the type of the value, and the value itself.
+    This function walks a dictionary representing a JSON structure
+    depth-first, flattening it into a list of tuples. Each tuple contains
+    the full key path, as a tuple of keys, the type of the value, and the
+    value itself.
     It handles nested dictionaries and lists, extracting information
-    from each level.
+    from each level. Nested objects are visited through an explicit stack
+    of iterators instead of recursion, so every level appends to the same
+    output list while keeping the key order of the document.
 
     Args:
         data (dict): The JSON data as a dictionary.
-        parent_key (str, optional): The key path of the parent object. Defaults to "".
+        parent_path (tuple, optional): The key path of the parent object.
+            Defaults to ().
 
     Returns:
         list: A list of tuples, where each tuple contains the key path,
             value type, and example value.
     """
     items = []
-    for key, value in data.items():
-        new_key = f'{parent_key}.{key}' if parent_key else key
-        if isinstance(value, dict):
-            items.extend(explore_json(value, new_key))
-        elif isinstance(value, list):
-            if value:
-                first_value = value[0]
-                if isinstance(first_value, dict):
-                    items.extend(explore_json(first_value, f'{new_key}'))
-                elif isinstance(first_value, str):
-                    items.append((new_key, 'list', first_value))
+    stack = [(iter(data.items()), parent_path)]
+    while stack:
+        entries, parent_path = stack[-1]
+        for key, value in entries:
+            new_path = (*parent_path, key)
+            value_type = type(value)
+            if value_type is dict:
+                stack.append((iter(value.items()), new_path))
+                break
+            if value_type is list:
+                if value:
+                    first_value = value[0]
+                    if type(first_value) is dict:
+                        stack.append((iter(first_value.items()), new_path))
+                        break
+                    if type(first_value) is str:
+                        items.append((new_path, 'list', first_value))
+            else:
+                items.append((new_path, value_type.__name__, value))
         else:
-            items.append((new_key, type(value).__name__, value))
+            stack.pop()
     return items
 
 
-def read_json_file(file_path: str) -> dict:
-    """Reads a JSON file and returns its content as a dictionary.
+def iter_top_level_items(file_path: str, backend=ijson) -> Iterator[tuple]:
+    """Streams the top-level key-value pairs of a JSON file.
+
+    This function parses the specified JSON file incrementally with
+    `ijson`, yielding each top-level key together with its fully built
+    value. Only one top-level value is held in memory at a time, instead
+    of the whole document. Numbers are returned as `float`/`int`, like
+    the `json` module does.
+
+    Args:
+        file_path (str): The path to the JSON file.
+        backend (module, optional): The `ijson` backend used to parse the
+            file. Defaults to the fastest one available.
+
+    Yields:
+        tuple: The top-level key and its value.
+    """
+    with open(file_path, 'rb') as file:
+        yield from backend.kvitems(file, '', use_float=True)
+
 
-    This function opens the specified JSON file, reads its contents,
-    and parses it into a Python dictionary using the `json` module.
-    It handles UTF-8 encoding to support a wide range of characters.
+def collect_tables(file_path: str, backend=ijson) -> tuple:
+    """Collects the documentation rows of every top-level key.
 
     Args:
         file_path (str): The path to the JSON file.
+        backend (module, optional): The `ijson` backend used to parse the
+            file. Defaults to the fastest one available.
 
     Returns:
-        dict: The JSON data as a Python dictionary.
+        tuple: A dict mapping each main key to its rows and a dict mapping
+            each main key to the type name of its value.
     """
-    with open(file_path, 'r', encoding='utf-8') as file:
-        data = json.load(file)
-    return data
+    tables = defaultdict(list)
+    main_keys_with_types: dict[str, str] = {}
+    # The key being processed is shown as a postfix without forcing a
+    # redraw, so tqdm only writes to stderr once per mininterval.
+    progress_bar = tqdm(
+        iter_top_level_items(file_path, backend), mininterval=0.2
+    )
+    for main_key, sub_dict in progress_bar:
+        progress_bar.set_postfix_str(main_key, refresh=False)
+        main_keys_with_types.setdefault(main_key, type(sub_dict).__name__)
+        # A list is documented by the structure of its first element.
+        target = (
+            sub_dict[0] if type(sub_dict) is list and sub_dict else sub_dict
+        )
+        if type(target) is not dict:
+            continue
+        records = explore_json(target)
+        if records:
+            tables[main_key].extend(make_row(*record) for record in records)
+    return tables, main_keys_with_types
 
 
 def create_xlsx_docs(file_path: str = FILE_PATH) -> None:
@@ -76,11 +141,6 @@ def create_xlsx_docs(file_path: str = FILE_PATH) -> None:
     Returns:
         None
     """
-    data = read_json_file(file_path)
-
-    if not data:
-        raise ValueError('O arquivo JSON está vazio!')
-
     # if 'output' in file_path.split('/')[-1]:
     #     content = data.get('result', {})
     # elif 'input' in file_path.split('/')[-1]:
@@ -90,236 +150,271 @@ def create_xlsx_docs(file_path: str = FILE_PATH) -> None:
     #         "O arquivo JSON não possui a chave 'content' ou 'result'!"
     #     )
 
-    tables = defaultdict(list)
-    main_keys_with_types = set()
-    for main_key, sub_dict in tqdm(data.items()):
-        tqdm.write(f'Processando {main_key}...', end='\r')
-        main_keys_with_types.add((main_key, type(sub_dict).__name__))
-        if isinstance(sub_dict, dict):
-            records = explore_json(sub_dict)
-            for record in records:
-                keys_path, value_type, example_value = record
-                keys_split = keys_path.split('.')
-                depth = len(keys_split)
-                row = {
-                    f'Chave nível {i + 1}': keys_split[i] for i in range(depth)
-                }
-                row['Tipo'] = value_type
-                row['Exemplo'] = example_value
-                tables[main_key].append(row)
-        elif isinstance(sub_dict, list) and sub_dict:
-            first_value = sub_dict[0]
-            records = explore_json(first_value)
-            for record in records:
-                keys_path, value_type, example_value = record
-                keys_split = keys_path.split('.')
-                depth = len(keys_split)
-                row = {
-                    f'Chave nível {i + 1}': keys_split[i] for i in range(depth)
-                }
-                row['Tipo'] = value_type
-                row['Exemplo'] = example_value
-                tables[main_key].append(row)
-
-        tqdm.write(f'Processando {main_key}... OK')
+    try:
+        tables, main_keys_with_types = collect_tables(file_path)
+    except ijson.IncompleteJSONError as error:
+        # The C backend only parses integers that fit in 64 bits; the pure
+        # Python one accepts any size, as `json` does, but is much slower.
+        # Nothing has been written yet, so the whole pass is simply redone.
+        if 'integer overflow' not in str(error):
+            raise
+        tables, main_keys_with_types = collect_tables(
+            file_path, ijson.get_backend('python')
+        )
+
+    if not main_keys_with_types:
+        raise ValueError('O arquivo JSON está vazio!')
 
-    output_filename = file_path.replace('.json', '.xlsx')
-    with pd.ExcelWriter(output_filename) as writer:
-        
-        df = pd.DataFrame()
-        df['Chave primária'] = [main_key[0] for main_key in main_keys_with_types]
-        df['Tipo'] = [main_key[1] for main_key in main_keys_with_types]
-        df['Significado'] = None
-        df['Observações'] = None
-        df.fillna('---', inplace=True)
-        df.to_excel(writer, sheet_name='Chaves Principais', index=False)
-        
-        for sheet_name, data in tables.items():
-            df = pd.DataFrame(data)
-            df['Significado'] = None
-            df['Unidade'] = None
-            df['Obrigatório'] = 'SIM'
-            df['Limite Mínimo'] = None
-            df['Limite Máximo'] = None
-            df['Observações'] = None
-
-            # Reorder columns
-            columns = [
-                col for col in df.columns.tolist() if col.startswith('Chave')
-            ]
-            columns = sorted(columns, key=lambda x: x.split()[-1])
-            columns.extend([
-                'Exemplo',
-                'Tipo',
-                'Unidade',
-                'Significado',
-                'Obrigatório',
-                'Observações',
-                'Limite Mínimo',
-                'Limite Máximo',
-            ])
-            df = df[columns]
-
-            # rename columns
-            df.rename(
-                columns={
-                    'Chave nível 1': 'Chave primária',
-                    'Chave nível 2': 'Chave secundária',
-                    'Chave nível 3': 'Chave terciária',
-                    'Chave nível 4': 'Chave quaternária',
-                    'Chave nível 5': 'Chave quinária',
-                    'Chave nível 6': 'Chave senária',
-                },
-                inplace=True,
-                errors='ignore',
-            )
+    sheets = {name: prepare_sheet(rows) for name, rows in tables.items()}
 
-            # fill NaN values
-            df.fillna('---', inplace=True)
-
-            df = (
-                df.groupby([
-                    col
-                    for col in df.columns[:3].tolist()
-                    if col.startswith('Chave')
-                ])
-                .agg({
-                    'Exemplo': 'first',
-                    'Tipo': 'first',
-                    'Unidade': 'first',
-                    'Significado': 'first',
-                    'Obrigatório': 'first',
-                    'Observações': 'first',
-                    'Limite Mínimo': 'first',
-                    'Limite Máximo': 'first',
-                })
-                .reset_index()
+    output_filename = file_path.replace('.json', '.xlsx')
+    # xlsxwriter always deflates the package at zlib's default level (6);
+    # level 1 compresses the sheet XML several times faster for a slightly
+    # larger file. The patch only lasts until this workbook is closed.
+    fast_zip = partial(ZipFile, compresslevel=1)
+    # Example values are documentation text: skip xlsxwriter's per-string
+    # formula/URL detection so every string goes straight to write_string.
+    with patch('xlsxwriter.workbook.ZipFile', fast_zip), xlsxwriter.Workbook(
+        output_filename,
+        {'strings_to_formulas': False, 'strings_to_urls': False},
+    ) as workbook:
+        formats = create_formats(workbook)
+        used_names = set()
+
+        write_worksheet(
+            workbook.add_worksheet(
+                make_sheet_name('Chaves Principais', used_names)
+            ),
+            ['Chave primária', 'Tipo', 'Significado', 'Observações'],
+            [
+                (main_key, main_type, '---', '---')
+                for main_key, main_type in main_keys_with_types.items()
+            ],
+            formats,
+        )
+
+        for main_key, (header, rows) in sheets.items():
+            sheet_name = make_sheet_name(main_key, used_names)
+            write_worksheet(
+                workbook.add_worksheet(sheet_name), header, rows, formats
             )
-            df.to_excel(writer, sheet_name=sheet_name, index=False)
 
-    config_xlsx(output_filename)
     print('Arquivo Excel gerado com sucesso!')
 
 
-def merge_equal_cells(sheet, col: str) -> None:
+def make_row(keys_path: tuple, value_type: str, example_value) -> tuple:
+    """Builds a documentation row in the output column order.
+
+    This function lays a record out directly as the tuple written to the
+    sheet: one key level per column of `KEY_COLUMNS`, padded with "---"
+    when the path is shallower, followed by the example, the type and the
+    columns to be filled in by hand.
+
+    Args:
+        keys_path (tuple): The key path, one key per level.
+        value_type (str): The name of the value type.
+        example_value: The example value, None for JSON nulls.
+
+    Returns:
+        tuple: The row, in the order of `KEY_COLUMNS` and `INFO_COLUMNS`.
+    """
+    n_levels = len(KEY_COLUMNS)
+    keys = keys_path[:n_levels]
+    return (
+        *keys,
+        *('---',) * (n_levels - len(keys)),
+        '---' if example_value is None else example_value,
+        value_type,
+        '---',
+        '---',
+        'SIM',
+        '---',
+        '---',
+        '---',
+    )
+
+
+def prepare_sheet(data: list) -> tuple:
+    """Builds the header and rows of a documentation sheet.
+
+    This function takes the rows collected for a main key and keeps only
+    the first row of each distinct key path, considering the first three
+    key levels. The rows are sorted by that path, and key columns that
+    are empty on every row are dropped.
+
+    Args:
+        data (list): The rows of the sheet, as built by `make_row`.
+
+    Returns:
+        tuple: The header, as a list of column names, and the rows, as a
+            list of tuples.
+    """
+    n_levels = len(KEY_COLUMNS)
+    n_keys = sum(
+        any(row[i] != '---' for row in data) for i in range(n_levels)
+    )
+    seen = set()
+    rows = []
+    for row in data:
+        key = row[:n_levels]
+        if key in seen:
+            continue
+        seen.add(key)
+        rows.append(row[:n_keys] + row[n_levels:])
+    rows.sort(key=lambda row: row[:n_keys])
+    return [*KEY_COLUMNS[:n_keys], *INFO_COLUMNS], rows
+
+
+def make_sheet_name(name: str, used_names: set) -> str:
+    """Builds a valid and unique worksheet name from a JSON key.
+
+    Excel forbids the characters `[]:*?/\\` and a leading or trailing
+    apostrophe in sheet names, limits them to 31 characters and compares
+    them ignoring case. This function replaces the forbidden characters
+    with "_", strips the apostrophes, truncates the name to that limit
+    and, when it is already in use, appends a numeric suffix
+    (e.g. "data1"), shortening the name further so the suffix still fits.
+
+    Args:
+        name (str): The desired sheet name.
+        used_names (set): The lowercased names already taken. The
+            returned name is added to it.
+
+    Returns:
+        str: The sheet name to pass to `add_worksheet`.
+    """
+    name = SHEET_NAME_INVALID_CHARS.sub('_', name).strip("'") or '_'
+    sheet_name = name[:SHEET_NAME_MAX_LENGTH].rstrip("'")
+    suffix = 0
+    while sheet_name.lower() in used_names:
+        suffix += 1
+        max_length = SHEET_NAME_MAX_LENGTH - len(str(suffix))
+        sheet_name = f'{name[:max_length]}{suffix}'
+    used_names.add(sheet_name.lower())
+    return sheet_name
+
+
+def merge_equal_cells(sheet, col_idx: int, values: tuple, cell_format) -> None:
     """Merges cells with equal values in a given column of an Excel sheet.
 
-    This function iterates through the specified column of the provided
-    `openpyxl` worksheet and merges contiguous cells that have the same
-    value. It starts from the first row and continues until the last row,
-    merging cells vertically whenever a sequence of identical values is found.
+    This function walks the values written to the specified column of the
+    provided `xlsxwriter` worksheet once, tracking runs of identical
+    values, and merges each run longer than one cell vertically. Ranges
+    are given as zero-indexed row/column numbers, so no A1 strings are
+    built or parsed.
 
     Args:
-        sheet: The `openpyxl` worksheet object.
-        col: The column letter (e.g., 'A', 'B', 'C') to process.
+        sheet: The `xlsxwriter` worksheet object.
+        col_idx (int): The zero-indexed column to process.
+        values (tuple): The values written to the column, header excluded.
+        cell_format: The `xlsxwriter` format applied to the merged cells.
 
     Returns:
         None
     """
-    max_row = sheet.max_row
-    start_row = 1
-    while start_row <= max_row:
-        cell_value = sheet[f'{col}{start_row}'].value
-        end_row = start_row
-        while (
-            end_row <= max_row and sheet[f'{col}{end_row}'].value == cell_value
-        ):
-            end_row += 1
-        if end_row - start_row > 1:
-            sheet.merge_cells(f'{col}{start_row}:{col}{end_row - 1}')
-        start_row = end_row
-
-
-def config_xlsx(xlsx_path: str) -> None:
-    """Configures and styles an XLSX file.
-
-    This function takes the path to an XLSX file, loads it using `openpyxl`,
-    and applies various formatting styles. It sets fonts, fills, borders,
-    merges cells, and configures auto-filters to enhance the readability
-    and presentation of the data in the Excel sheets.
+    # Data starts on the second row of the sheet.
+    start = 1
+    prev = values[0] if values else None
+    for i, value in enumerate(values[1:], start=2):
+        if value != prev:
+            if i - start > 1:
+                sheet.merge_range(
+                    start, col_idx, i - 1, col_idx, prev, cell_format
+                )
+            start, prev = i, value
+    end = len(values) + 1
+    if end - start > 1:
+        sheet.merge_range(start, col_idx, end - 1, col_idx, prev, cell_format)
+
+
+def create_formats(workbook) -> dict:
+    """Creates the cell formats used to style the XLSX documentation.
+
+    This function registers every format needed by `write_worksheet` in
+    the given `xlsxwriter` workbook, so each style is allocated once and
+    shared by all the cells and sheets that use it.
 
     Args:
-        xlsx_path (str): The path to the XLSX file.
+        workbook: The `xlsxwriter` workbook object.
 
     Returns:
-        None
+        dict: The header, body, "Sim"/"Não" and per-type formats.
     """
-    wb = load_workbook(xlsx_path)
-
-    # Definir as cores de preenchimento
-    fill_yes = PatternFill(
-        start_color='00FF00', end_color='00FF00', fill_type='solid'
-    )  # Verde para "Sim"
-    fill_no = PatternFill(
-        start_color='FF0000', end_color='FF0000', fill_type='solid'
-    )  # Vermelho para "Não"
-    mapping_color_per_type = {
-        'int': 'FFFF00',  # Amarelo
-        'float': 'FFA500',  # Laranja
-        'str': 'ADD8E6',  # Azul Claro
-        'list': '90EE90',  # Verde Claro
-        'dict': 'D3D3D3',  # Cinza Claro
-        'bool': 'FFC0CB',  # Rosa Claro
+    base = {
+        'align': 'center',
+        'valign': 'vcenter',
+        'border': 1,
     }
     mapping_color_per_type = {
-        k: PatternFill(start_color=v, end_color=v, fill_type='solid')
-        for k, v in mapping_color_per_type.items()
+        'int': '#FFFF00',  # Amarelo
+        'float': '#FFA500',  # Laranja
+        'str': '#ADD8E6',  # Azul Claro
+        'list': '#90EE90',  # Verde Claro
+        'dict': '#D3D3D3',  # Cinza Claro
+        'bool': '#FFC0CB',  # Rosa Claro
+    }
+    return {
+        'header': workbook.add_format({**base, 'bold': True}),
+        'body': workbook.add_format(base),
+        # Verde para "Sim"
+        'yes': workbook.add_format({**base, 'bg_color': '#00FF00'}),
+        # Vermelho para "Não"
+        'no': workbook.add_format({**base, 'bg_color': '#FF0000'}),
+        'types': {
+            k: workbook.add_format({**base, 'bg_color': v})
+            for k, v in mapping_color_per_type.items()
+        },
     }
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin'),
-    )
-
-    for ws in wb.worksheets:
-        for cell in ws[1]:
-            cell.font = Font(bold=True)
-
-        for row in ws.iter_rows(
-            min_row=2, max_row=ws.max_row, min_col=1, max_col=1
-        ):
-            for cell in row:
-                if cell.value.lower() == 'sim':
-                    cell.fill = fill_yes
-                elif cell.value.lower() == 'não':
-                    cell.fill
-
-        for col in ws.columns:
-            max_length = 0
-            column = col[0].column_letter
-            for cell in col:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except Exception:
-                    pass
-                cell.alignment = Alignment(
-                    horizontal='center', vertical='center'
-                )
-                cell.border = thin_border
-                if (
-                    col[0].value == 'Tipo'
-                    and cell.value in mapping_color_per_type
-                ):
-                    cell.fill = mapping_color_per_type.get(cell.value)
 
-            adjusted_width = max_length + 8
-            ws.column_dimensions[column].width = adjusted_width
 
-            if col[0].value.startswith('Chave'):
-                merge_equal_cells(ws, column)
+def write_worksheet(ws, header: list, rows: list, formats: dict) -> None:
+    """Writes and styles the rows of a worksheet.
 
-            if col[0].value == 'Obrigatório':
-                for cell in col:
-                    if cell.value.lower() == 'sim':
-                        cell.fill = fill_yes
-                    elif cell.value.lower() == 'não':
-                        cell.fill = fill_no
+    This function writes the header and every row to the provided
+    `xlsxwriter` worksheet, freezing the header, and sets the shared body
+    format and width once per column. It then applies the per-value fills,
+    merged cells and the auto-filter to enhance the readability and
+    presentation of the data.
 
-        ws.auto_filter.ref = ws.dimensions
+    Args:
+        ws: The `xlsxwriter` worksheet object.
+        header (list): The column names.
+        rows (list): The rows to write, as sequences of values.
+        formats (dict): The formats created by `create_formats`.
 
-    wb.save(xlsx_path)
+    Returns:
+        None
+    """
+    n_rows, n_cols = len(rows), len(header)
+    ws.write_row(0, 0, header, formats['header'])
+    ws.freeze_panes(1, 0)
+    # Body cells are written without a format and inherit the shared one
+    # set on their column below.
+    for row_idx, row in enumerate(rows, start=1):
+        ws.write_row(row_idx, 0, row)
+
+    # Transpose once instead of slicing every row again for each column.
+    columns = zip(*rows)
+    for col_idx, (column, values) in enumerate(zip(header, columns)):
+        max_length = max(len(str(column)), *map(len, map(str, values)))
+        adjusted_width = max_length + 8
+        ws.set_column(col_idx, col_idx, adjusted_width, formats['body'])
+
+        if column == 'Tipo':
+            for row_idx, value in enumerate(values, start=1):
+                if value in formats['types']:
+                    ws.write(row_idx, col_idx, value, formats['types'][value])
+        elif column == 'Obrigatório':
+            for row_idx, value in enumerate(values, start=1):
+                if value == 'SIM':
+                    ws.write(row_idx, col_idx, value, formats['yes'])
+                elif value == 'NÃO':
+                    ws.write(row_idx, col_idx, value, formats['no'])
+
+        if column.startswith('Chave'):
+            merge_equal_cells(ws, col_idx, values, formats['body'])
+
+    ws.autofilter(0, 0, n_rows, n_cols - 1)
 
 
 if __name__ == '__main__':